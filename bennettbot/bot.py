@@ -123,7 +123,7 @@ def register_listeners(app, config, channels, bot_user_id, internal_user_ids):
         # matched by the tech-support listener
         matchers=[
             lambda event: (
-                not support_config["tech-support"]["regex"].match(event["text"])
+                not support_config["tech-support"]["regex"].search(event["text"])
             )
         ],
     )
@@ -145,7 +145,7 @@ def register_listeners(app, config, channels, bot_user_id, internal_user_ids):
         matchers=[
             lambda message: (
                 message["channel_type"] == "im"
-                and not support_config["tech-support"]["regex"].match(message["text"])
+                and not support_config["tech-support"]["regex"].search(message["text"])
             )
         ],
     )
@@ -249,7 +249,7 @@ def register_listeners(app, config, channels, bot_user_id, internal_user_ids):
 
             # match the keyword
             text = event.get("message", event)["text"]
-            return regex.match(text) is not None
+            return regex.search(text) is not None
 
         return matcher
 
@@ -3,6 +3,19 @@ import re
 from . import settings
 
 
+# Match "tech-support" as a word (treating hyphens as word characters), except if
+# it's preceded by a slash to avoid matching it in URLs.
+# These patterns are unanchored, so should be used with `search` rather than `match`.
+TECH_SUPPORT_REGEX = re.compile(r"(?:^|[^\w\-/])tech-support(?:$|[^\w\-])", flags=re.I)
+
+# Match any of "bennett-admins" or "bennet-admins" or "bennett-admin" or
+# "bennet-admin" as a word (treating hyphens as word characters), except if
+# it's preceded by a slash to avoid matching it in URLs
+BENNETT_ADMINS_REGEX = re.compile(
+    r"(?:^|[^\w\-/])bennett?-admins?(?:$|[^\w\-])", flags=re.I
+)
+
+
 def get_support_config(channels=None):
     channels = channels or {}
     return {
@@ -15,9 +28,7 @@ def get_support_config(channels=None):
             "support_channel": channels.get(
                 settings.SLACK_TECH_SUPPORT_CHANNEL, settings.SLACK_TECH_SUPPORT_CHANNEL
             ),
-            # Match "tech-support" as a word (treating hyphens as word characters), except if
-            # it's preceded by a slash to avoid matching it in URLs
-            "regex": re.compile(r".*(^|[^\w\-/])tech-support($|[^\w\-]).*", flags=re.I),
+            "regex": TECH_SUPPORT_REGEX,
             "reaction": "sos",
         },
         "bennett-admins": {
@@ -31,12 +42,7 @@ def get_support_config(channels=None):
                 settings.SLACK_BENNETT_ADMINS_CHANNEL,
                 settings.SLACK_BENNETT_ADMINS_CHANNEL,
             ),
-            # Match any of "bennett-admins" or "bennet-admins" or "bennett-admin" or
-            # "bennet-admin" as a word (treating hyphens as word characters), except if
-            # it's preceded by a slash to avoid matching it in URLs
-            "regex": re.compile(
-                r".*(^|[^\w\-/])bennett?-admins?($|[^\w\-]).*", flags=re.I
-            ),
+            "regex": BENNETT_ADMINS_REGEX,
             "reaction": "flamingo",
         },
     }
@@ -6,7 +6,7 @@ import subprocess
 import sys
 import time
 import traceback
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, date, datetime, timedelta
 from multiprocessing import Process
 from pathlib import Path
 
@@ -15,7 +15,16 @@ import requests
 from . import job_configs, scheduler, settings
 from .config import get_support_config
 from .logger import logger
-from .slack import notify_slack, slack_web_client
+from .slack import MAX_MESSAGE_TEXT_LENGTH, notify_slack, slack_web_client
+
+
+# Slack formats URLs in message text with angle brackets, e.g. <http://foo.com> or
+# <http://foo.com|foo>
+URL_REGEX = re.compile(r"<http[^>]+>")
+
+# Bounds (in seconds) for how long the dispatcher waits between checks for jobs
+MIN_POLL_DELAY = 0.05
+MAX_POLL_DELAY = 1
 
 
 def run():  # pragma: no cover
@@ -23,9 +32,13 @@ def run():  # pragma: no cover
     slack_client = slack_web_client(token_type="bot")
     checker = MessageChecker(slack_client, slack_web_client(token_type="user"))
     checker.run_check()
+    delay = MIN_POLL_DELAY
     while True:
-        run_once(slack_client, job_configs.config)
-        time.sleep(1)
+        processes = run_once(slack_client, job_configs.config)
+        # Check again soon after starting jobs, as there may be more to come;
+        # otherwise back off gradually to avoid polling the db too often
+        delay = MIN_POLL_DELAY if processes else min(delay * 2, MAX_POLL_DELAY)
+        time.sleep(delay)
 
 
 def run_once(slack_client, config):
@@ -140,7 +153,13 @@ class JobDispatcher:
         )
         if not error:
             if self.job_config["report_stdout"]:
-                content = self.stdout_path.read_text()
+                with self.stdout_path.open() as f:
+                    if self.job_config["report_format"] == "text":
+                        # Slack would truncate anything longer, so there's no
+                        # need to read it all
+                        content = f.read(MAX_MESSAGE_TEXT_LENGTH)
+                    else:
+                        content = f.read()
                 if self.job_config["report_format"] == "blocks":
                     # a suppress_empty job legitimately produces no stdout
                     # when there's nothing to report, so only load json if there's
@@ -219,23 +238,43 @@ class JobDispatcher:
         Not tested out of developer laziness.
         """
 
+        fabfile_path = self.cwd / "fabfile.py"
+        etag_path = self.cwd / ".fabfile.py.etag"
+
+        # Only fetch the fabfile if it has changed since we last fetched it
+        headers = {}
+        if fabfile_path.exists() and etag_path.exists():
+            headers["If-None-Match"] = etag_path.read_text()
+
         try:
-            rsp = requests.get(self.fabfile_url)
+            rsp = requests.get(self.fabfile_url, headers=headers)
             rsp.raise_for_status()
         except requests.RequestException as e:
             msg = f"Could not refresh {self.fabfile_url}: {e}"
             notify_slack(self.slack_client, settings.SLACK_LOGS_CHANNEL, msg)
             return
 
-        with open(self.cwd / "fabfile.py", "w") as f:
-            f.write(rsp.text)
+        if rsp.status_code == 304:
+            return
+
+        # Only rewrite the fabfile if its content has changed, and write it
+        # atomically so a concurrently starting job never sees a partial file
+        if not fabfile_path.exists() or fabfile_path.read_text() != rsp.text:
+            tmp_path = fabfile_path.with_name(f".fabfile.py.{os.getpid()}.tmp")
+            tmp_path.write_text(rsp.text)
+            os.replace(tmp_path, fabfile_path)
+
+        if "ETag" in rsp.headers:
+            etag_path.write_text(rsp.headers["ETag"])
+        else:
+            etag_path.unlink(missing_ok=True)
 
     def set_up_log_dir(self):
         """Create directory for recording stdout/stderr."""
         timestamp = datetime.now(UTC).strftime("%Y%m%d-%H%M%S")
-        job_log_path = Path(self.job["type"]) / timestamp
-        self.log_dir = settings.LOGS_DIR / job_log_path
-        self.host_log_dir = settings.HOST_LOGS_DIR / job_log_path
+        job_log_path = f"{self.job['type']}/{timestamp}"
+        self.log_dir = Path(settings.LOGS_DIR, job_log_path)
+        self.host_log_dir = Path(settings.HOST_LOGS_DIR, job_log_path)
         self.stdout_path = self.log_dir / "stdout"
         self.stderr_path = self.log_dir / "stderr"
         self.log_dir.mkdir(parents=True, exist_ok=True)
@@ -251,6 +290,37 @@ class MessageChecker:
         self.user_slack_client = user_slack_client
 
         self.config = get_support_config()
+        # Everything in the search query except the date is fixed for each
+        # keyword, so build the queries up front and only fill in the date on
+        # each check
+        self.search_query_templates = {
+            support_type: {
+                keyword: self._build_search_query_template(
+                    keyword,
+                    support_config["reaction"],
+                    support_config["support_channel"],
+                )
+                for keyword in support_config["search_keywords"]
+            }
+            for support_type, support_config in self.config.items()
+        }
+
+    @staticmethod
+    def _build_search_query_template(keyword, reaction, channel):
+        return (
+            # Search for messages with the keyword but without the expected reaction
+            # Wrap the keyword in double quotes so we don't return "tech support" as
+            # well as "tech-support"
+            f'"{keyword}" -has::{reaction}: '
+            # exclude messages in the channel itself
+            f"-in:#{channel} "
+            # exclude messages from the bot
+            f"-from:@{settings.SLACK_APP_USERNAME} "
+            # exclude DMs as the auto-responders don't respond to these anyway
+            "-is:dm "
+            # only include messages from today and yesterday
+            "after:{after}"
+        )
 
     def run_check(self):  # pragma: no cover
         """Start running the check in a new subprocess."""
@@ -265,12 +335,16 @@ class MessageChecker:
         # rate limited at around 20 calls per min
         # https://api.slack.com/apis/rate-limits#tier_t2
         # A 10s delay should be safe for our 2 calls per loop
+        check_from_date = None
         while run_fn():
             # check for messages from today and yesterday; sometimes it seems to
             # take a while for slack to return messages in search results, so
             # make sure that messages sent late in the day still get picked up
-            today = datetime.today()
-            check_from = (today - timedelta(days=2)).strftime("%Y-%m-%d")
+            # This only changes once a day, so only recalculate it when it does
+            today = date.today()
+            if today != check_from_date:
+                check_from_date = today
+                check_from = (today - timedelta(days=2)).isoformat()
             for support_type in self.config:
                 self.check_messages(support_type, check_from)
             time.sleep(delay)
@@ -279,37 +353,28 @@ class MessageChecker:
         logger.debug("Checking %s messages", support_type)
         reaction = self.config[support_type]["reaction"]
         channel = self.config[support_type]["support_channel"]
-        keywords = self.config[support_type]["search_keywords"]
         regex = self.config[support_type]["regex"]
 
         messages = []
-        for keyword in keywords:
+        for keyword, query_template in self.search_query_templates[
+            support_type
+        ].items():
             messages.extend(
                 self.user_slack_client.search_messages(
-                    query=(
-                        # Search for messages with the keyword but without the expected reaction
-                        # Wrap the keyword in double quotes so we don't return "tech support" as
-                        # well as "tech-support"
-                        f'"{keyword}" -has::{reaction}: '
-                        # exclude messages in the channel itself
-                        f"-in:#{channel} "
-                        # exclude messages from the bot
-                        f"-from:@{settings.SLACK_APP_USERNAME} "
-                        # exclude DMs as the auto-responders don't respond to these anyway
-                        f"-is:dm "
-                        # only include messages from today and yesterday
-                        f"after:{after}"
-                    )
+                    query=query_template.format(after=after)
                 )["messages"]["matches"]
             )
 
+        if not messages:
+            return
+
         handled = []
         for message in messages:
             if message in handled:
                 continue
             handled.append(message)
             # remove any URLs from the message text; we don't want to match these
-            if not re.match(regex, message["text"]):
+            if not regex.search(URL_REGEX.sub("", message["text"])):
                 # Either the message contained the keyword in a URL only (and we've
                 # just removed it), or it didn't contain the keyword at all.
                 # The latter happens if it's a forwarded message or a copy/pasted link.
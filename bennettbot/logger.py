@@ -19,23 +19,28 @@ logger = structlog.get_logger()
 def log_call(fn):
     """Decorate fn to log its arguments and return value each time it's called."""
 
-    spec = inspect.getfullargspec(fn)
+    arg_names = inspect.getfullargspec(fn).args
+    name = fn.__name__
+    start_msg = name + " {"
+    end_msg = name + " }"
 
     @functools.wraps(fn)
     def wrapper(*args, **kwargs):
-        params = dict(zip(spec.args, args))
-        params.update(kwargs)
+        if not logger.is_enabled_for(logging.INFO):
+            return fn(*args, **kwargs)
 
-        logger.info(fn.__name__ + " {")
+        params = {**dict(zip(arg_names, args)), **kwargs}
+
+        logger.info(start_msg)
         if params:
-            logger.info(fn.__name__, **params)
+            logger.info(name, **params)
 
         rv = fn(*args, **kwargs)
 
         if rv:
-            logger.info(fn.__name__, rv=rv)
+            logger.info(name, rv=rv)
 
-        logger.info(fn.__name__ + " }")
+        logger.info(end_msg)
 
         return rv
 
@@ -155,7 +155,8 @@ def cancel_suppressions(job_type):
 def remove_expired_suppressions():
     """Remove expired suppressions.
 
-    This is not logged because it is called every second by the dispatcher.
+    This is not logged because it is called up to several times a second by the
+    dispatcher.
     """
 
     with closing(get_connection()) as conn:
@@ -174,7 +175,8 @@ def reserve_job():
 
     is reserved.  This updates the started_at column on the database record.
 
-    This is not logged because it is called every second by the dispatcher.
+    This is not logged because it is called up to several times a second by the
+    dispatcher.
     """
 
     sql = """
@@ -271,6 +273,26 @@ def get_suppressions():
         return suppressions
 
 
+@log_call
+def get_active_suppression(job_type):
+    """Retrieve a suppression currently in effect for jobs of given type, or None
+    if there isn't one."""
+
+    sql = """
+    SELECT *
+    FROM suppression
+    WHERE job_type = ? AND start_at < ? AND end_at > ?
+    ORDER BY id
+    LIMIT 1
+    """
+
+    now = _now()
+    with closing(get_connection()) as conn:
+        with conn:
+            suppressions = list(conn.execute(sql, [job_type, now, now]))
+    return suppressions[0] if suppressions else None
+
+
 def _now():
     return datetime.now(UTC)
 
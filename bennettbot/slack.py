@@ -8,6 +8,11 @@ from workspace.utils.blocks import get_basic_header_and_text_blocks, truncate_te
 from .logger import logger
 
 
+# Slack truncates the text of messages longer than this
+# https://api.slack.com/methods/chat.postMessage#truncating
+MAX_MESSAGE_TEXT_LENGTH = 40000
+
+
 def slack_web_client(token_type="bot"):
     match token_type:
         case "bot":
@@ -1,3 +1,4 @@
+import functools
 import json
 
 from flask import Response, abort, request
@@ -9,6 +10,12 @@ from ..signatures import InvalidHMAC, validate_hmac
 from ..slack import notify_slack, slack_web_client
 
 
+@functools.cache
+def _slack_client():
+    """Return a Slack client shared across webhook requests handled by this worker."""
+    return slack_web_client()
+
+
 def handle_github_webhook(project):
     """Respond to webhooks from GitHub, and schedule a deploy of
     the relevant project if required.
@@ -40,15 +47,15 @@ def verify_signature(request):
     if header is None:
         abort(403)
 
-    if header[:5] != "sha1=":
+    # The header should be "sha1=" followed by a 40 character hex digest; reject
+    # anything else without computing the HMAC
+    if not header.startswith("sha1=") or len(header) != 45:
         abort(403)
 
-    signature = header[5:]
+    signature = header[5:].encode("utf8")
 
     try:
-        validate_hmac(
-            request.data, settings.GITHUB_WEBHOOK_SECRET, signature.encode("utf8")
-        )
+        validate_hmac(request.data, settings.GITHUB_WEBHOOK_SECRET, signature)
     except InvalidHMAC:
         abort(403)
 
@@ -56,7 +63,7 @@ def verify_signature(request):
 def should_deploy(request):
     """Return whether webhook is notification of merged PR."""
 
-    data = json.loads(request.data.decode())
+    data = json.loads(request.data)
 
     if not data.get("pull_request"):
         return False
@@ -76,18 +83,10 @@ def schedule_deploy(project):
     scheduler.schedule_job(job, {}, channel, "", delay_seconds=60)
 
     # Notify if deploys are suppressed
-    active_suppression = next(
-        (
-            suppression
-            for suppression in scheduler.get_suppressions()
-            if suppression["start_at"] < str(scheduler._now())
-            and suppression["job_type"] == job
-        ),
-        None,
-    )
+    active_suppression = scheduler.get_active_suppression(job)
     if active_suppression:
         notify_slack(
-            slack_web_client(),
+            _slack_client(),
             channel,
             (
                 "PR merged, not deploying because deploys suppressed until "
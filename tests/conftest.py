@@ -21,6 +21,15 @@ def reset_db():
         pass
 
 
+@pytest.fixture
+def logs_dir(tmp_path, monkeypatch):
+    # Write each test's job logs to a fresh directory, so there's nothing to
+    # clean up between tests
+    logs_dir = tmp_path / "logs"
+    monkeypatch.setattr(settings, "LOGS_DIR", logs_dir)
+    monkeypatch.setattr(settings, "HOST_LOGS_DIR", logs_dir)
+
+
 @pytest.fixture(autouse=True)
 def reset_repos_config_cache():
     """Clear cached YAML config between tests so patches don't leak."""
@@ -476,6 +476,19 @@ def _tech_support_test_params():
         ("This message should match the `tech-support` listener", "C0002", {}, "C0001"),
         ("tech-support - this message should match", "C0002", {}, "C0001"),
         ("This message should match - tech-support", "C0002", {}, "C0001"),
+        # The keyword can be on any line of a multi-line message
+        (
+            "This message should match\nthe tech-support listener",
+            "C0002",
+            {},
+            "C0001",
+        ),
+        (
+            "This message should not match\nthe #tech-support-internal listener",
+            "C0002",
+            {},
+            None,
+        ),
         ("This message should match the bennett-admins listener", "C0002", {}, "C0000"),
         # deliberate typos below
         ("This message should match the bennet-admins listener", "C0002", {}, "C0000"),
@@ -681,14 +694,17 @@ def test_tech_support_out_of_office_dates(
         assert first_message["text"] == "http://example.com"
 
 
-def test_tech_support_listener_in_direct_message(mock_app):
+@pytest.mark.parametrize(
+    "text", ["Calling tech-support", "Some context\nthen calling tech-support"]
+)
+def test_tech_support_listener_in_direct_message(mock_app, text):
     # If the tech support handler is triggered in a DM, it doesn't get
     # reposted to the techsupport channel
     assert_tech_support_paths_not_called()
 
     handle_message(
         mock_app,
-        "Calling tech-support",
+        text,
         channel="IM0001",
         reaction_count=0,
         event_type="message",
@@ -1,7 +1,6 @@
 import json
 import os
 import platform
-import shutil
 from pathlib import Path
 from unittest.mock import Mock, patch
 
@@ -29,20 +28,31 @@ from .mock_http_request import (
 from .time_helpers import T0, TS, T
 
 
-# Make sure all tests run when datetime.now() returning T0
-pytestmark = pytest.mark.freeze_time(T0)
+# Make sure all tests run when datetime.now() returning T0, and write job logs
+# to a fresh temporary directory
+pytestmark = [pytest.mark.freeze_time(T0), pytest.mark.usefixtures("logs_dir")]
 
+# Messages sent for most jobs: the start notice in the logs channel and, when a
+# job fails, the failure message url reposted to the tech support channel
+ABOUT_TO_START = {"channel": "logs", "text": "about to start"}
+TECH_SUPPORT_REPOST = {
+    "channel": settings.SLACK_TECH_SUPPORT_CHANNEL,
+    "text": "http://example.com",
+}
 
-@pytest.fixture(autouse=True)
-def remove_logs_dir():
-    shutil.rmtree(settings.LOGS_DIR, ignore_errors=True)
+
+@pytest.fixture(scope="module", autouse=True)
+def mocketizer():
+    with Mocketizer(strict_mode=True):
+        yield
 
 
 @pytest.fixture(autouse=True)
-def mock_http():
+def mock_http(mocketizer):
+    # Mocket stays enabled for the whole module; just clear out registered
+    # entries and recorded requests from the previous test
+    Mocket.reset()
     register_dispatcher_uris()
-    with Mocketizer(strict_mode=True):
-        yield
 
 
 def test_run_once():
@@ -64,109 +74,72 @@ def test_run_once():
     assert not os.path.exists(build_log_dir("test_really_bad_job"))
 
 
-def test_job_success_with_unsafe_shell_args():
-    log_dir = build_log_dir("test_parameterised_job_2")
-
-    scheduler.schedule_job(
-        "test_parameterised_job_2", {"thing_to_echo": "<poem>"}, "channel", TS, 0
-    )
-    job = scheduler.reserve_job()
-    do_job(slack_web_client(), job)
-    assert_slack_client_sends_messages(
-        messages_kwargs=[
-            {"channel": "logs", "text": "about to start"},
-            {"channel": "channel", "text": "succeeded"},
-        ],
-    )
-
-    with open(os.path.join(log_dir, "stdout")) as f:
-        assert f.read() == "<poem>\n"
-
-    with open(os.path.join(log_dir, "stderr")) as f:
-        assert f.read() == ""
-
-
-def test_job_success():
-    log_dir = build_log_dir("test_good_job")
-
-    scheduler.schedule_job("test_good_job", {}, "channel", TS, 0)
-    job = scheduler.reserve_job()
-
-    do_job(slack_web_client(), job)
-
-    assert_slack_client_sends_messages(
-        messages_kwargs=[
-            {"channel": "logs", "text": "about to start"},
-            {"channel": "channel", "text": "succeeded"},
-        ],
-    )
-
-    with open(os.path.join(log_dir, "stdout")) as f:
-        assert f.read() == "the owl and the pussycat\n"
-
-    with open(os.path.join(log_dir, "stderr")) as f:
-        assert f.read() == ""
-
-
-def test_job_success_with_parameterised_args():
-    log_dir = build_log_dir("test_parameterised_job")
+@pytest.mark.parametrize(
+    "job_type,args,expected_report,expected_stdout",
+    [
+        ("test_good_job", {}, "succeeded", "the owl and the pussycat\n"),
+        (
+            "test_parameterised_job",
+            {"n": "10"},
+            "succeeded",
+            "the owl and the pussycat\n",
+        ),
+        # unsafe shell args are escaped
+        (
+            "test_parameterised_job_2",
+            {"thing_to_echo": "<poem>"},
+            "succeeded",
+            "<poem>\n",
+        ),
+        ("test_reported_job", {}, "the owl", "the owl and the pussycat\n"),
+        # nothing is reported back to the channel
+        ("test_unreported_job", {}, None, "the owl and the pussycat\n"),
+        ("test_good_python_job", {}, "Hello World!\n", "Hello World!\n"),
+        (
+            "test_parameterised_python_job",
+            {"name": "Fred"},
+            "Hello Fred!\n",
+            "Hello Fred!\n",
+        ),
+        # namespace config with no python file
+        ("test1_good_job", {}, "succeeded", "the owl and the pussycat\n"),
+    ],
+)
+def test_job_success(job_type, args, expected_report, expected_stdout):
+    log_dir = build_log_dir(job_type)
 
-    scheduler.schedule_job("test_parameterised_job", {"n": "10"}, "channel", TS, 0)
+    scheduler.schedule_job(job_type, args, "channel", TS, 0)
     job = scheduler.reserve_job()
 
     do_job(slack_web_client(), job)
-    assert_slack_client_sends_messages(
-        messages_kwargs=[
-            {"channel": "logs", "text": "about to start"},
-            {"channel": "channel", "text": "succeeded"},
-        ],
-    )
 
-    with open(os.path.join(log_dir, "stdout")) as f:
-        assert f.read() == "the owl and the pussycat\n"
+    messages_kwargs = [ABOUT_TO_START]
+    if expected_report is not None:
+        messages_kwargs.append({"channel": "channel", "text": expected_report})
+    assert_slack_client_sends_messages(messages_kwargs=messages_kwargs)
 
-    with open(os.path.join(log_dir, "stderr")) as f:
-        assert f.read() == ""
+    stdout, stderr = read_logs(log_dir)
+    assert stdout == expected_stdout
+    assert stderr == ""
 
 
-def test_job_success_and_report():
-    log_dir = build_log_dir("test_reported_job")
-
+@patch("bennettbot.dispatcher.MAX_MESSAGE_TEXT_LENGTH", 10)
+def test_job_success_and_report_long_output():
     scheduler.schedule_job("test_reported_job", {}, "channel", TS, 0)
     job = scheduler.reserve_job()
 
     do_job(slack_web_client(), job)
     assert_slack_client_sends_messages(
         messages_kwargs=[
-            {"channel": "logs", "text": "about to start"},
-            {"channel": "channel", "text": "the owl"},
+            ABOUT_TO_START,
+            {"channel": "channel", "text": "the owl an"},
         ],
     )
-
-    with open(os.path.join(log_dir, "stdout")) as f:
-        assert f.read() == "the owl and the pussycat\n"
-
-    with open(os.path.join(log_dir, "stderr")) as f:
-        assert f.read() == ""
-
-
-def test_job_success_with_no_report():
-    log_dir = build_log_dir("test_unreported_job")
-
-    scheduler.schedule_job("test_unreported_job", {}, "channel", TS, 0)
-    job = scheduler.reserve_job()
-
-    do_job(slack_web_client(), job)
-    assert_slack_client_sends_messages(
-        messages_kwargs=[{"channel": "logs", "text": "about to start"}],
+    assert (
+        get_mock_received_requests()["/api/chat.postMessage"][-1]["text"]
+        == "the owl an"
     )
 
-    with open(os.path.join(log_dir, "stdout")) as f:
-        assert f.read() == "the owl and the pussycat\n"
-
-    with open(os.path.join(log_dir, "stderr")) as f:
-        assert f.read() == ""
-
 
 @patch("bennettbot.dispatcher.settings.MAX_SLACK_NOTIFY_RETRIES", 0)
 def test_job_success_with_slack_exception():
@@ -193,11 +166,9 @@ def test_job_success_with_slack_exception():
 
     do_job(client, job)
 
-    with open(os.path.join(log_dir, "stdout")) as f:
-        assert f.read() == "the owl and the pussycat\n"
-
-    with open(os.path.join(log_dir, "stderr")) as f:
-        assert f.read() == ""
+    stdout, stderr = read_logs(log_dir)
+    assert stdout == "the owl and the pussycat\n"
+    assert stderr == ""
 
 
 def test_job_failure():
@@ -208,21 +179,16 @@ def test_job_failure():
     do_job(slack_web_client(), job)
     assert_slack_client_sends_messages(
         messages_kwargs=[
-            {"channel": "logs", "text": "about to start"},
+            ABOUT_TO_START,
             {"channel": "channel", "text": "failed"},
             # failed message url reposted to tech support channel
-            {
-                "channel": settings.SLACK_TECH_SUPPORT_CHANNEL,
-                "text": "http://example.com",
-            },
+            TECH_SUPPORT_REPOST,
         ],
     )
 
-    with open(os.path.join(log_dir, "stdout")) as f:
-        assert f.read() == ""
-
-    with open(os.path.join(log_dir, "stderr")) as f:
-        assert f.read() == "cat: no-poem: No such file or directory\n"
+    stdout, stderr = read_logs(log_dir)
+    assert stdout == ""
+    assert stderr == "cat: no-poem: No such file or directory\n"
 
 
 def test_job_failure_but_configured_not_to_call_tech_support():
@@ -233,16 +199,14 @@ def test_job_failure_but_configured_not_to_call_tech_support():
     do_job(slack_web_client(), job)
     assert_slack_client_sends_messages(
         messages_kwargs=[
-            {"channel": "logs", "text": "about to start"},
+            ABOUT_TO_START,
             {"channel": "channel", "text": "failed"},
         ]
     )
 
-    with open(os.path.join(log_dir, "stdout")) as f:
-        assert f.read() == ""
-
-    with open(os.path.join(log_dir, "stderr")) as f:
-        assert f.read() == "cat: no-poem: No such file or directory\n"
+    stdout, stderr = read_logs(log_dir)
+    assert stdout == ""
+    assert stderr == "cat: no-poem: No such file or directory\n"
 
 
 def test_job_failure_in_dm():
@@ -254,16 +218,14 @@ def test_job_failure_in_dm():
     assert_slack_client_sends_messages(
         # NOTE: NOT reposted to tech support from a DM with the bot
         messages_kwargs=[
-            {"channel": "logs", "text": "about to start"},
+            ABOUT_TO_START,
             {"channel": "IM0001", "text": "failed"},
         ],
     )
 
-    with open(os.path.join(log_dir, "stdout")) as f:
-        assert f.read() == ""
-
-    with open(os.path.join(log_dir, "stderr")) as f:
-        assert f.read() == "cat: no-poem: No such file or directory\n"
+    stdout, stderr = read_logs(log_dir)
+    assert stdout == ""
+    assert stderr == "cat: no-poem: No such file or directory\n"
 
 
 def test_job_failure_when_command_not_found():
@@ -275,21 +237,16 @@ def test_job_failure_when_command_not_found():
     do_job(slack_web_client(), job)
     assert_slack_client_sends_messages(
         messages_kwargs=[
-            {"channel": "logs", "text": "about to start"},
+            ABOUT_TO_START,
             {"channel": "channel", "text": f"failed.\nFind logs in {log_dir}"},
             # failed message url reposted to tech support channel
-            {
-                "channel": settings.SLACK_TECH_SUPPORT_CHANNEL,
-                "text": "http://example.com",
-            },
+            TECH_SUPPORT_REPOST,
         ],
     )
 
-    with open(os.path.join(log_dir, "stdout")) as f:
-        assert f.read() == ""
-
-    with open(os.path.join(log_dir, "stderr")) as f:
-        assert f.read() == "/bin/sh: 1: dog: not found\n"
+    stdout, stderr = read_logs(log_dir)
+    assert stdout == ""
+    assert stderr == "/bin/sh: 1: dog: not found\n"
 
 
 @patch("bennettbot.settings.HOST_LOGS_DIR", "/host/logs/")
@@ -302,62 +259,15 @@ def test_job_failure_with_host_log_dirs_setting():
 
     assert_slack_client_sends_messages(
         messages_kwargs=[
-            {"channel": "logs", "text": "about to start"},
+            ABOUT_TO_START,
             {"channel": "channel", "text": "failed.\nFind logs in /host/logs/"},
             # failed message url reposted to tech support channel
-            {
-                "channel": settings.SLACK_TECH_SUPPORT_CHANNEL,
-                "text": "http://example.com",
-            },
+            TECH_SUPPORT_REPOST,
         ],
     )
 
-    with open(os.path.join(log_dir, "stderr")) as f:
-        assert f.read() == "cat: no-poem: No such file or directory\n"
-
-
-def test_python_job_success():
-    log_dir = build_log_dir("test_good_python_job")
-
-    scheduler.schedule_job("test_good_python_job", {}, "channel", TS, 0)
-    job = scheduler.reserve_job()
-
-    do_job(slack_web_client(), job)
-    assert_slack_client_sends_messages(
-        messages_kwargs=[
-            {"channel": "logs", "text": "about to start"},
-            {"channel": "channel", "text": "Hello World!\n"},
-        ],
-    )
-
-    with open(os.path.join(log_dir, "stdout")) as f:
-        assert f.read() == "Hello World!\n"
-
-    with open(os.path.join(log_dir, "stderr")) as f:
-        assert f.read() == ""
-
-
-def test_python_job_success_with_parameterised_args():
-    log_dir = build_log_dir("test_parameterised_python_job")
-
-    scheduler.schedule_job(
-        "test_parameterised_python_job", {"name": "Fred"}, "channel", TS, 0
-    )
-    job = scheduler.reserve_job()
-
-    do_job(slack_web_client(), job)
-    assert_slack_client_sends_messages(
-        messages_kwargs=[
-            {"channel": "logs", "text": "about to start"},
-            {"channel": "channel", "text": "Hello Fred!\n"},
-        ],
-    )
-
-    with open(os.path.join(log_dir, "stdout")) as f:
-        assert f.read() == "Hello Fred!\n"
-
-    with open(os.path.join(log_dir, "stderr")) as f:
-        assert f.read() == ""
+    _, stderr = read_logs(log_dir)
+    assert stderr == "cat: no-poem: No such file or directory\n"
 
 
 def test_python_job_success_with_blocks():
@@ -373,7 +283,7 @@ def test_python_job_success_with_blocks():
 
     assert_slack_client_sends_messages(
         messages_kwargs=[
-            {"channel": "logs", "text": "about to start"},
+            ABOUT_TO_START,
             {
                 "channel": "channel",
                 "text": "{'type': 'plain_text', 'text': 'Hello World!'}",
@@ -382,11 +292,9 @@ def test_python_job_success_with_blocks():
         ],
         message_format="blocks",
     )
-    with open(os.path.join(log_dir, "stdout")) as f:
-        assert json.load(f) == expected_blocks
-
-    with open(os.path.join(log_dir, "stderr")) as f:
-        assert f.read() == ""
+    stdout, stderr = read_logs(log_dir)
+    assert json.loads(stdout) == expected_blocks
+    assert stderr == ""
 
 
 def test_python_job_failure_with_blocks():
@@ -399,23 +307,17 @@ def test_python_job_failure_with_blocks():
 
     assert_slack_client_sends_messages(
         messages_kwargs=[
-            {"channel": "logs", "text": "about to start"},
+            ABOUT_TO_START,
             {"channel": "channel", "text": "failed"},
             # failed message url reposted to tech support channel
-            {
-                "channel": settings.SLACK_TECH_SUPPORT_CHANNEL,
-                "text": "http://example.com",
-            },
+            TECH_SUPPORT_REPOST,
         ],
     )
 
-    with open(os.path.join(log_dir, "stdout")) as f:
-        assert f.read() == ""
-
-    with open(os.path.join(log_dir, "stderr")) as f:
-        stderr = f.read()
-        assert "Traceback (most recent call last):" in stderr
-        assert "An error was found!" in stderr
+    stdout, stderr = read_logs(log_dir)
+    assert stdout == ""
+    assert "Traceback (most recent call last):" in stderr
+    assert "An error was found!" in stderr
 
 
 def test_python_job_failure():
@@ -426,22 +328,16 @@ def test_python_job_failure():
     do_job(slack_web_client(), job)
     assert_slack_client_sends_messages(
         messages_kwargs=[
-            {"channel": "logs", "text": "about to start"},
+            ABOUT_TO_START,
             {"channel": "channel", "text": "failed"},
             # failed message url reposted to tech support channel
-            {
-                "channel": settings.SLACK_TECH_SUPPORT_CHANNEL,
-                "text": "http://example.com",
-            },
+            TECH_SUPPORT_REPOST,
         ],
     )
 
-    with open(os.path.join(log_dir, "stdout")) as f:
-        assert f.read() == ""
-
-    with open(os.path.join(log_dir, "stderr")) as f:
-        stderr = f.read()
-        assert "No such file or directory" in stderr
+    stdout, stderr = read_logs(log_dir)
+    assert stdout == ""
+    assert "No such file or directory" in stderr
 
 
 def test_python_job_with_no_output():
@@ -453,16 +349,14 @@ def test_python_job_with_no_output():
     do_job(slack_web_client(), job)
     assert_slack_client_sends_messages(
         messages_kwargs=[
-            {"channel": "logs", "text": "about to start"},
+            ABOUT_TO_START,
             {"channel": "channel", "text": "No output found for command"},
         ],
     )
 
-    with open(os.path.join(log_dir, "stdout")) as f:
-        assert f.read() == ""
-
-    with open(os.path.join(log_dir, "stderr")) as f:
-        assert f.read() == ""
+    stdout, stderr = read_logs(log_dir)
+    assert stdout == ""
+    assert stderr == ""
 
 
 def test_python_job_with_no_output_suppressed():
@@ -476,13 +370,13 @@ def test_python_job_with_no_output_suppressed():
     do_job(slack_web_client(), job)
     assert_slack_client_sends_messages(
         messages_kwargs=[
-            {"channel": "logs", "text": "about to start"},
+            ABOUT_TO_START,
         ],
     )
     assert_slack_client_doesnt_react_to_message()
 
-    with open(os.path.join(log_dir, "stdout")) as f:
-        assert f.read() == ""
+    stdout, _ = read_logs(log_dir)
+    assert stdout == ""
 
 
 def test_python_job_with_no_output_suppressed_reacts_to_message():
@@ -503,7 +397,7 @@ def test_python_job_with_no_output_suppressed_reacts_to_message():
     do_job(slack_web_client(), job)
     assert_slack_client_sends_messages(
         messages_kwargs=[
-            {"channel": "logs", "text": "about to start"},
+            ABOUT_TO_START,
         ],
     )
     assert_slack_client_reacts_to_message(1)
@@ -551,27 +445,6 @@ def test_failed_job_reacts_with_x():
     assert request["timestamp"] == ["1234567890.123456"]
 
 
-def test_job_success_config_with_no_python_file():
-    log_dir = build_log_dir("test1_good_job")
-
-    scheduler.schedule_job("test1_good_job", {}, "channel", TS, 0)
-    job = scheduler.reserve_job()
-
-    do_job(slack_web_client(), job)
-    assert_slack_client_sends_messages(
-        messages_kwargs=[
-            {"channel": "logs", "text": "about to start"},
-            {"channel": "channel", "text": "succeeded"},
-        ],
-    )
-
-    with open(os.path.join(log_dir, "stdout")) as f:
-        assert f.read() == "the owl and the pussycat\n"
-
-    with open(os.path.join(log_dir, "stderr")) as f:
-        assert f.read() == ""
-
-
 def test_job_with_code_format():
     scheduler.schedule_job("test_good_job_with_code", {}, "channel", TS, 0)
     job = scheduler.reserve_job()
@@ -580,7 +453,7 @@ def test_job_with_code_format():
 
     assert_slack_client_sends_messages(
         messages_kwargs=[
-            {"channel": "logs", "text": "about to start"},
+            ABOUT_TO_START,
             {
                 "channel": "channel",
                 "text": "```the owl and the pussycat\n```",
@@ -625,7 +498,7 @@ def test_job_with_long_code_output_is_uploaded_as_file():
     )
     assert_slack_client_sends_messages(
         messages_kwargs=[
-            {"channel": "logs", "text": "about to start"},
+            ABOUT_TO_START,
         ],
     )
 
@@ -635,6 +508,14 @@ def do_job(client, job):
     job_dispatcher.do_job()
 
 
+def read_logs(log_dir):
+    """Return the contents of a job's stdout and stderr logs."""
+    return (
+        Path(log_dir, "stdout").read_text(),
+        Path(log_dir, "stderr").read_text(),
+    )
+
+
 def build_log_dir(job_type_with_namespace):
     return os.path.join(
         settings.LOGS_DIR, job_type_with_namespace, T0.strftime("%Y%m%d-%H%M%S")
@@ -655,7 +536,7 @@ def test_message_checker_run(freezer):
 
     # Mock the run function so the checker runs twice, not forever
     run_fn = Mock(side_effect=[True, True, False])
-    checker.do_check(run_fn, delay=0.1)
+    checker.do_check(run_fn, delay=0)
 
     # search.messages is called once per search keyword for each
     # run of the checker (mocked above to run only 2x)
@@ -706,6 +587,11 @@ def test_message_checker_matched_messages(support_type, support_channel, reactio
                     "channel": {"id": "C4444"},
                     "ts": "100.3",
                 },
+                {
+                    "text": f"Ignore message with keyword in url fragment <https://calling/test#{keyword}>",
+                    "channel": {"id": "C4444"},
+                    "ts": "100.4",
+                },
             ]
         )
 
@@ -794,5 +680,6 @@ def test_python_version():
 
     do_job(slack_web_client(), job)
 
-    version_in_job = (Path(log_dir) / "stdout").read_text().strip()
+    stdout, _ = read_logs(log_dir)
+    version_in_job = stdout.strip()
     assert version_in_job == platform.python_version()
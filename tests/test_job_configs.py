@@ -199,109 +199,64 @@ def test_build_config():
     }
 
 
-def test_build_config_with_bad_job_config():
-    # fmt: off
-    raw_config = {
-        "ns": {
-            "jobs": {
-                "good_job": {"run_args_templat": "cat [poem]"}
-            },
-            "slack": []
-        }
-    }
-    # fmt: on
+@pytest.mark.parametrize(
+    "job_config,error",
+    [
+        ({"run_args_templat": "cat [poem]"}, "missing keys"),
+        ({"run_args_template": "cat [poem]", "extra_param": 123}, "extra keys"),
+    ],
+)
+def test_build_config_with_bad_job_config(job_config, error):
+    raw_config = {"ns": {"jobs": {"good_job": job_config}, "slack": []}}
 
     with pytest.raises(RuntimeError) as e:
         build_config(raw_config)
-    assert "missing keys" in str(e)
+    assert error in str(e)
 
-    # fmt: off
-    raw_config = {
-        "ns": {
-            "jobs": {
-                "good_job": {
-                    "run_args_template": "cat [poem]",
-                    "extra_param": 123
-                }
-            },
-            "slack": []
-        }
-    }
-    # fmt: on
-
-    with pytest.raises(RuntimeError) as e:
-        build_config(raw_config)
-    assert "extra keys" in str(e)
-
-
-def test_build_config_with_bad_slack_config():
-    # fmt: off
-    raw_config = {
-        "ns": {
-            "jobs": {},
-            "slack": [
-                {
-                    "command": "do good job",
-                    "action": "schedule_job",
-                    "job_type": "good_job",
-                }
-            ]
-        }
-    }
-    # fmt: on
-
-    with pytest.raises(RuntimeError) as e:
-        build_config(raw_config)
-    assert "missing keys" in str(e)
 
-    # fmt: off
-    raw_config = {
-        "ns": {
-            "jobs": {
-                "good_job": {
-                    "run_args_template": "cat [poem]",
-                }
+@pytest.mark.parametrize(
+    "slack_config,error",
+    [
+        (
+            {
+                "command": "do good job",
+                "action": "schedule_job",
+                "job_type": "good_job",
             },
-            "slack": [
-                {
-                    "command": "do good job",
-                    "help": "do job well",
-                    "action": "schedule_job",
-                    "job_type": "good_job",
-                    "extra_param": 123,
-                }
-            ]
-        }
-    }
-    # fmt: on
-
-    with pytest.raises(RuntimeError) as e:
-        build_config(raw_config)
-    assert "extra keys" in str(e)
-
-    # fmt: off
+            "missing keys",
+        ),
+        (
+            {
+                "command": "do good job",
+                "help": "do job well",
+                "action": "schedule_job",
+                "job_type": "good_job",
+                "extra_param": 123,
+            },
+            "extra keys",
+        ),
+        (
+            {
+                "command": "do good job",
+                "help": "do job well",
+                "action": "schedule_job",
+                "job_type": "odd_job",
+            },
+            "unknown job type",
+        ),
+    ],
+)
+def test_build_config_with_bad_slack_config(slack_config, error):
     raw_config = {
         "ns": {
-            "jobs": {
-                "good_job": {
-                    "run_args_template": "cat [poem]",
-                }
-            },
-            "slack": [
-                {
-                    "command": "do good job",
-                    "help": "do job well",
-                    "action": "schedule_job",
-                    "job_type": "odd_job",
-                }
-            ]
+            "jobs": {"good_job": {"run_args_template": "cat [poem]"}},
+            "slack": [slack_config],
         }
     }
-    # fmt: on
 
     with pytest.raises(RuntimeError) as e:
         build_config(raw_config)
-    assert "unknown job type" in str(e)
+    assert error in str(e)
 
 
 def test_build_config_with_invalid_report_format():
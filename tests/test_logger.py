@@ -0,0 +1,29 @@
+import logging
+from unittest.mock import call, patch
+
+from bennettbot.logger import log_call
+
+
+@log_call
+def add(a, b):
+    return a + b
+
+
+@patch("bennettbot.logger.logger")
+def test_log_call(mock_logger):
+    mock_logger.is_enabled_for.return_value = True
+    assert add(1, b=2) == 3
+    mock_logger.is_enabled_for.assert_called_once_with(logging.INFO)
+    assert mock_logger.info.call_args_list == [
+        call("add {"),
+        call("add", a=1, b=2),
+        call("add", rv=3),
+        call("add }"),
+    ]
+
+
+@patch("bennettbot.logger.logger")
+def test_log_call_when_info_logging_disabled(mock_logger):
+    mock_logger.is_enabled_for.return_value = False
+    assert add(1, b=2) == 3
+    mock_logger.info.assert_not_called()
@@ -247,6 +247,25 @@ def test_remove_expired_suppressions(freezer):
     assert_suppression_matches(ss[1], "good_job", T(20), T(30))
 
 
+def test_get_active_suppression(freezer):
+    scheduler.schedule_suppression("good_job", T(5), T(15))
+    scheduler.schedule_suppression("odd_job", T(10), T(20))
+    scheduler.schedule_suppression("good_job", T(20), T(30))
+
+    assert scheduler.get_active_suppression("good_job") is None
+
+    freezer.move_to(T(12))
+    assert_suppression_matches(
+        scheduler.get_active_suppression("good_job"), "good_job", T(5), T(15)
+    )
+
+    freezer.move_to(T(17))
+    assert scheduler.get_active_suppression("good_job") is None
+    assert_suppression_matches(
+        scheduler.get_active_suppression("odd_job"), "odd_job", T(10), T(20)
+    )
+
+
 def test_reserve_job_with_no_jobs_scheduled():
     assert not scheduler.reserve_job()
 
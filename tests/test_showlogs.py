@@ -9,6 +9,9 @@ from bennettbot import settings
 from .test_dispatcher import build_log_dir
 
 
+pytestmark = pytest.mark.usefixtures("logs_dir")
+
+
 def setup_failed_logs(error="foo", output="bar"):
     log_dir = Path(build_log_dir("err_bad_job"))
     log_dir.mkdir(exist_ok=True, parents=True)
@@ -1,5 +1,3 @@
-from unittest.mock import patch
-
 import pytest
 from mocket import Mocket, mocketize
 
@@ -21,15 +19,22 @@ PAYLOAD_PR_OPENED = '{"action": "opened", "pull_request": {}}'
 PAYLOAD_ISSUE_OPENED = '{"action": "opened", "issue": {}}'
 
 
-dummy_config = build_config(
-    {
-        "test": {
-            "default_channel": "#some-team",
-            "jobs": {"deploy": {"run_args_template": "fab deploy:production"}},
-            "slack": [],
+@pytest.fixture(scope="module")
+def dummy_config():
+    return build_config(
+        {
+            "test": {
+                "default_channel": "#some-team",
+                "jobs": {"deploy": {"run_args_template": "fab deploy:production"}},
+                "slack": [],
+            }
         }
-    }
-)
+    )
+
+
+@pytest.fixture
+def use_dummy_config(monkeypatch, dummy_config):
+    monkeypatch.setattr("bennettbot.webserver.github.config", dummy_config)
 
 
 def test_no_auth_header(web_client):
@@ -49,22 +54,26 @@ def test_invalid_auth_header(web_client):
     assert rsp.status_code == 403
 
 
-def test_valid_auth_header(web_client):
+def test_invalid_auth_header_with_digest_of_correct_length(web_client):
+    headers = {"X-Hub-Signature": "sha1=0000000000000000000000000000000000000000"}
+    rsp = web_client.post("/github/test/", data=PAYLOAD_PR_CLOSED, headers=headers)
+    assert rsp.status_code == 403
+
+
+def test_valid_auth_header(web_client, use_dummy_config):
     headers = {"X-Hub-Signature": "sha1=3e09e676b4a62b634401b44b4c4ff1f58404e746"}
 
-    with patch("bennettbot.webserver.github.config", new=dummy_config):
-        rsp = web_client.post("/github/test/", data=PAYLOAD_PR_CLOSED, headers=headers)
+    rsp = web_client.post("/github/test/", data=PAYLOAD_PR_CLOSED, headers=headers)
 
     assert rsp.status_code == 200
 
 
 @mocketize(strict_mode=True)
-def test_on_closed_merged_pr(web_client):
+def test_on_closed_merged_pr(web_client, use_dummy_config):
     mocket_register({"chat.postMessage": {"ok": True}})
     headers = {"X-Hub-Signature": "sha1=3e09e676b4a62b634401b44b4c4ff1f58404e746"}
 
-    with patch("bennettbot.webserver.github.config", new=dummy_config):
-        rsp = web_client.post("/github/test/", data=PAYLOAD_PR_CLOSED, headers=headers)
+    rsp = web_client.post("/github/test/", data=PAYLOAD_PR_CLOSED, headers=headers)
 
     assert rsp.status_code == 200
     jj = scheduler.get_jobs_of_type("test_deploy")
@@ -75,7 +84,7 @@ def test_on_closed_merged_pr(web_client):
 
 
 @mocketize(strict_mode=True)
-def test_on_closed_merged_pr_with_suppression(web_client):
+def test_on_closed_merged_pr_with_suppression(web_client, use_dummy_config):
     mocket_register({"chat.postMessage": [{"ok": True}]})
     scheduler.schedule_suppression("test_deploy", T(-60), T(60))
 
@@ -83,8 +92,7 @@ def test_on_closed_merged_pr_with_suppression(web_client):
         "X-Hub-Signature": "sha1=3e09e676b4a62b634401b44b4c4ff1f58404e746",
     }
 
-    with patch("bennettbot.webserver.github.config", new=dummy_config):
-        rsp = web_client.post("/github/test/", data=PAYLOAD_PR_CLOSED, headers=headers)
+    rsp = web_client.post("/github/test/", data=PAYLOAD_PR_CLOSED, headers=headers)
 
     assert rsp.status_code == 200
     jj = scheduler.get_jobs_of_type("test_deploy")
@@ -98,25 +106,18 @@ def test_on_closed_merged_pr_with_suppression(web_client):
     )
 
 
-def test_on_closed_unmerged_pr(web_client):
-    headers = {"X-Hub-Signature": "sha1=9bd6f75640ef7a6c1a573cf5d423be7d8ed23c3b"}
-    rsp = web_client.post(
-        "/github/test/", data=PAYLOAD_PR_CLOSED_UNMERGED, headers=headers
-    )
-    assert rsp.status_code == 200
-    assert not scheduler.get_jobs_of_type("test_deploy")
-
-
-def test_on_opened_pr(web_client):
-    headers = {"X-Hub-Signature": "sha1=4cc85e5c6e7a1f3a03aeaef924f1cfa7a3d72384"}
-    rsp = web_client.post("/github/test/", data=PAYLOAD_PR_OPENED, headers=headers)
-    assert rsp.status_code == 200
-    assert not scheduler.get_jobs_of_type("test_deploy")
-
-
-def test_on_opened_issue(web_client):
-    headers = {"X-Hub-Signature": "sha1=6e6218f3e729aca3abce2644128a1d29af2c76ab"}
-    rsp = web_client.post("/github/test/", data=PAYLOAD_ISSUE_OPENED, headers=headers)
+@pytest.mark.parametrize(
+    "payload,signature",
+    [
+        (PAYLOAD_PR_CLOSED_UNMERGED, "sha1=9bd6f75640ef7a6c1a573cf5d423be7d8ed23c3b"),
+        (PAYLOAD_PR_OPENED, "sha1=4cc85e5c6e7a1f3a03aeaef924f1cfa7a3d72384"),
+        (PAYLOAD_ISSUE_OPENED, "sha1=6e6218f3e729aca3abce2644128a1d29af2c76ab"),
+    ],
+)
+def test_no_deploy_scheduled(web_client, payload, signature):
+    # unmerged PRs, opened PRs and issues don't trigger a deploy
+    headers = {"X-Hub-Signature": signature}
+    rsp = web_client.post("/github/test/", data=payload, headers=headers)
     assert rsp.status_code == 200
     assert not scheduler.get_jobs_of_type("test_deploy")
 
@@ -14,6 +14,10 @@ from workspace.workflows import jobs
 # Use current year to avoid SystemTimeWarning when frozen time is too far in the past
 THIS_YEAR = datetime.now().year
 
+# Mocked GitHub API responses, read once and shared by every test
+WORKFLOWS_JSON = Path("tests/workspace/workflows.json").read_text()
+RUNS_JSON = Path("tests/workspace/runs.json").read_text()
+
 WORKFLOWS_MAIN = {
     82728346: "CI",
     88048829: "CodeQL",
@@ -21,6 +25,8 @@ WORKFLOWS_MAIN = {
     108457763: "Dependabot Updates",
     113602598: "Local job-server setup CI",
 }
+# Cache keys for WORKFLOWS_MAIN, in the order mocked conclusions are given
+WORKFLOW_IDS_MAIN = [str(workflow_id) for workflow_id in sorted(WORKFLOWS_MAIN)]
 WORKFLOWS = {
     **WORKFLOWS_MAIN,
     94122733: "Docs",
@@ -55,19 +61,35 @@ CACHE = {
         },
     }
 }
+
+# parse_args doesn't modify the parser, so all tests can share one
+PARSER = jobs.get_command_line_parser()
+
+
+def header_block(text):
+    return {"type": "header", "text": {"type": "plain_text", "text": text}}
+
+
+def section_block(text):
+    return {"type": "section", "text": {"type": "mrkdwn", "text": text}}
+
+
+# Mocked conclusions for all five workflows in WORKFLOWS_MAIN, and how they
+# are reported
+FAILED_RUNS = [["failure", "http://example.com/run/1"]] * 5
+FAILED_RUNS_TEXT = "<http://example.com/run/1|:red_circle:>" * 5
+SUCCESSFUL_RUNS = [["success", "http://example.com/run/1"]] * 5
+SUCCESSFUL_RUNS_TEXT = "<http://example.com/run/1|:large_green_circle:>" * 5
+
 RESULT_PATCH_SETTINGS = {
     "org": "opensafely-core",
     "repo": "airlock",
     "team": "Team RAP",
     "conclusions": [["success", "http://example.com"]] * 5,
 }
-RESULT_BLOCK = {
-    "type": "section",
-    "text": {
-        "type": "mrkdwn",
-        "text": f"<https://github.com/opensafely-core/airlock/actions?query=branch%3Amain|opensafely-core/airlock>: {'<http://example.com|:large_green_circle:>' * 5}",
-    },
-}
+RESULT_BLOCK = section_block(
+    f"<https://github.com/opensafely-core/airlock/actions?query=branch%3Amain|opensafely-core/airlock>: {'<http://example.com|:large_green_circle:>' * 5}"
+)
 
 
 @pytest.fixture
@@ -81,7 +103,7 @@ def mock_airlock_reporter():
     Entry.single_register(
         Entry.GET,
         "https://api.github.com/repos/opensafely-core/airlock/actions/workflows",
-        body=Path("tests/workspace/workflows.json").read_text(),
+        body=WORKFLOWS_JSON,
         match_querystring=True,
     )
 
@@ -89,7 +111,7 @@ def mock_airlock_reporter():
     Entry.single_register(
         Entry.GET,
         "https://api.github.com/repos/opensafely-core/airlock/actions/runs?per_page=100",
-        body=Path("tests/workspace/runs.json").read_text(),
+        body=RUNS_JSON,
         match_querystring=False,  # Test the querystring separately
     )
     with Mocketizer(strict_mode=True):
@@ -146,27 +168,25 @@ def use_mock_results(patch_settings, workflows_overrides=None):
         "security": {"excluded_repos": []},
     }
 
+    mock_cache = {
+        f"{r['org']}/{r['repo']}": {
+            "version": "1",
+            "timestamp": f"{THIS_YEAR}-01-15T09:00:08Z",
+            "conclusions": dict(zip(WORKFLOW_IDS_MAIN, r["conclusions"])),
+        }
+        for r in patch_settings
+    }
+
     def decorator_use_mock_results(func):
         @functools.wraps(func)
         def wrapper_use_mock_results(*args, **kwargs):
-            # Mock cache
-            keys = sorted(list(WORKFLOWS_MAIN.keys()))
-            mock_cache = {
-                f"{r['org']}/{r['repo']}": {
-                    "version": "1",
-                    "timestamp": f"{THIS_YEAR}-01-15T09:00:08Z",
-                    "conclusions": {
-                        str(keys[i]): conc for i, conc in enumerate(r["conclusions"])
-                    },
-                }
-                for r in patch_settings
-            }
             with (
                 patch(
                     "workspace.utils.repos_config.load_config",
                     return_value=mock_config,
                 ),
                 patch("workspace.workflows.jobs.load_cache", return_value=mock_cache),
+                patch("workspace.workflows.jobs.write_cache"),
                 patch(
                     "workspace.workflows.jobs.RepoWorkflowReporter",
                     MockRepoWorkflowReporter,
@@ -180,63 +200,18 @@ def use_mock_results(patch_settings, workflows_overrides=None):
 
 
 def test_print_key():
+    key = [
+        (":large_green_circle:", "Success"),
+        (":large_yellow_circle:", "Running"),
+        (":red_circle:", "Failure"),
+        (":white_circle:", "Skipped"),
+        (":heavy_multiplication_x:", "Cancelled"),
+        (":ghost:", "Missing"),
+        (":grey_question:", "Other"),
+    ]
     blocks = [
-        {
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": "Workflow status emoji key",
-            },
-        },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": ":large_green_circle:=Success",
-            },
-        },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": ":large_yellow_circle:=Running",
-            },
-        },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": ":red_circle:=Failure",
-            },
-        },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": ":white_circle:=Skipped",
-            },
-        },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": ":heavy_multiplication_x:=Cancelled",
-            },
-        },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": ":ghost:=Missing",
-            },
-        },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": ":grey_question:=Other",
-            },
-        },
+        header_block("Workflow status emoji key"),
+        *(section_block(f"{emoji}={label}") for emoji, label in key),
     ]
     assert json.loads(jobs.get_text_blocks_for_key(None)) == blocks
 
@@ -252,8 +227,7 @@ def test_print_usage():
 
 @pytest.mark.parametrize("command", ["show", "show --target all"])
 def test_all_as_target(command):
-    args = jobs.get_command_line_parser().parse_args(command.split())
-    args = jobs.get_command_line_parser().parse_args("show --target all".split())
+    args = PARSER.parse_args(command.split())
 
     with patch("workspace.workflows.jobs.summarise_all") as mock_summarise_all:
         jobs.main(args)
@@ -262,7 +236,7 @@ def test_all_as_target(command):
 
 @pytest.mark.parametrize("org", ["opensafely-core", "osc"])
 def test_org_as_target(org):
-    args = jobs.get_command_line_parser().parse_args(f"show --target {org}".split())
+    args = PARSER.parse_args(f"show --target {org}".split())
 
     with patch("workspace.workflows.jobs.summarise_org") as mock_summarise_org:
         jobs.main(args)
@@ -282,7 +256,7 @@ def test_org_as_target(org):
     ],
 )
 def test_repo_as_target(repo, parsed):
-    args = jobs.get_command_line_parser().parse_args(f"show --target {repo}".split())
+    args = PARSER.parse_args(f"show --target {repo}".split())
 
     with patch("workspace.workflows.jobs.RepoWorkflowReporter") as MockReporter:
         jobs.main(args)
@@ -290,9 +264,7 @@ def test_repo_as_target(repo, parsed):
 
 
 def test_website_repo_as_target():
-    args = jobs.get_command_line_parser().parse_args(
-        "show --target http://bennett.ox.ac.uk".split()
-    )
+    args = PARSER.parse_args("show --target http://bennett.ox.ac.uk".split())
     with patch("workspace.workflows.jobs.RepoWorkflowReporter") as MockReporter:
         jobs.main(args)
         MockReporter.assert_called_once_with("ebmdatalab/bennett.ox.ac.uk")
@@ -307,7 +279,7 @@ def test_website_repo_as_target():
     ],
 )
 def test_list_of_orgs_as_target(cli_args):
-    args = jobs.get_command_line_parser().parse_args(cli_args)
+    args = PARSER.parse_args(cli_args)
     with patch("workspace.workflows.jobs.summarise_org") as mock_summarise_org:
         jobs.main(args)
         mock_summarise_org.assert_any_call("opensafely-core", False)
@@ -316,9 +288,7 @@ def test_list_of_orgs_as_target(cli_args):
 
 
 def test_list_of_repos_as_target():
-    args = jobs.get_command_line_parser().parse_args(
-        ["show", "--target", "airlock bennett.ox.ac.uk"]
-    )
+    args = PARSER.parse_args(["show", "--target", "airlock bennett.ox.ac.uk"])
     with patch("workspace.workflows.jobs._summarise") as mock__summarise:
         jobs.main(args)
         mock__summarise.assert_called_once_with(
@@ -339,35 +309,19 @@ def test_list_of_repos_as_target():
     ],
 )
 def test_invalid_target(cli_args):
-    args = jobs.get_command_line_parser().parse_args(cli_args)
+    args = PARSER.parse_args(cli_args)
     blocks = json.loads(jobs.main(args))
-    assert blocks[0] == {
-        "type": "header",
-        "text": {
-            "type": "plain_text",
-            "text": "some/invalid/input was not recognised",
-        },
-    }
+    assert blocks[0] == header_block("some/invalid/input was not recognised")
 
 
 def test_mixed_list_as_target():
-    args = jobs.get_command_line_parser().parse_args(
-        ["show", "--target", "osc airlock"]
-    )
+    args = PARSER.parse_args(["show", "--target", "osc airlock"])
     blocks = json.loads(jobs.main(args))
-    assert blocks[0] == {
-        "type": "header",
-        "text": {
-            "type": "plain_text",
-            "text": "Invalid list of targets",
-        },
-    }
+    assert blocks[0] == header_block("Invalid list of targets")
 
 
 def test_catch_unhandled_error():
-    args = jobs.get_command_line_parser().parse_args(
-        "show --target some/invalid/input".split()
-    )
+    args = PARSER.parse_args("show --target some/invalid/input".split())
     with patch(
         "workspace.workflows.jobs.report_invalid_target",
         return_value=None,
@@ -375,20 +329,8 @@ def test_catch_unhandled_error():
     ):
         blocks = json.loads(jobs.main(args))
     assert blocks == [
-        {
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": "An error occurred reporting workflows for some/invalid/input",
-            },
-        },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": "Unknown error",
-            },
-        },
+        header_block("An error occurred reporting workflows for some/invalid/input"),
+        section_block("Unknown error"),
     ]
 
 
@@ -399,7 +341,7 @@ def test_get_workflows():
         Entry.GET,
         "https://api.github.com/repos/opensafely-core/airlock/actions/workflows",
         match_querystring=True,
-        body=Path("tests/workspace/workflows.json").read_text(),
+        body=WORKFLOWS_JSON,
     )
     reporter = jobs.RepoWorkflowReporter("opensafely-core/airlock")
     assert len(reporter.workflows) == 5
@@ -559,6 +501,70 @@ def test_write_to_cache_file(mock_airlock_reporter, cache_path):
     assert json.loads(cache_path.read_text()) == CACHE
 
 
+def test_get_latest_conclusions_for_repos(cache_path):
+    class CachingMockRepoWorkflowReporter(MockRepoWorkflowReporter):
+        write_cache_to_file = jobs.RepoWorkflowReporter.write_cache_to_file
+
+    repo_full_names = [f"opensafely-core/repo-{i}" for i in range(20)]
+    with (
+        patch("workspace.workflows.jobs.CACHE_PATH", cache_path),
+        patch(
+            "workspace.workflows.jobs.RepoWorkflowReporter",
+            CachingMockRepoWorkflowReporter,
+        ),
+        patch(
+            "workspace.workflows.jobs.write_cache", wraps=jobs.write_cache
+        ) as mock_write_cache,
+    ):
+        conclusions = jobs.get_latest_conclusions_for_repos(repo_full_names)
+
+    # Results are in the order requested, and every repo's cache entry is
+    # written to the cache file in a single write
+    assert list(conclusions) == repo_full_names
+    mock_write_cache.assert_called_once()
+    written = json.loads(cache_path.read_text())
+    assert set(written) == set(repo_full_names)
+    # No runs are returned and there's no previous cache, so all are missing
+    assert written["opensafely-core/repo-0"]["version"] == "1"
+    assert written["opensafely-core/repo-0"]["conclusions"] == {
+        str(workflow_id): ["missing", ""] for workflow_id in WORKFLOWS_MAIN
+    }
+
+
+def test_get_latest_conclusions_for_repos_keeps_entries_on_failure(cache_path):
+    other_job_entry = {"version": "1", "timestamp": "", "conclusions": {}}
+
+    class FailingMockRepoWorkflowReporter(MockRepoWorkflowReporter):
+        write_cache_to_file = jobs.RepoWorkflowReporter.write_cache_to_file
+
+        def get_runs(self, since_last_retrieval) -> list:
+            if self.repo_full_name == "opensafely-core/repo-1":
+                # Another workflows job writes the cache while this one runs
+                jobs.write_cache({"opensafely-core/other-repo": other_job_entry})
+                raise RuntimeError("API error")
+            return []
+
+    repo_full_names = [f"opensafely-core/repo-{i}" for i in range(3)]
+    with (
+        patch("workspace.workflows.jobs.CACHE_PATH", cache_path),
+        patch(
+            "workspace.workflows.jobs.RepoWorkflowReporter",
+            FailingMockRepoWorkflowReporter,
+        ),
+        pytest.raises(RuntimeError, match="API error"),
+    ):
+        jobs.get_latest_conclusions_for_repos(repo_full_names)
+
+    # The other repos' entries are written, and the other job's entry is kept
+    written = json.loads(cache_path.read_text())
+    assert set(written) == {
+        "opensafely-core/repo-0",
+        "opensafely-core/repo-2",
+        "opensafely-core/other-repo",
+    }
+    assert written["opensafely-core/other-repo"] == other_job_entry
+
+
 @pytest.mark.parametrize(
     "run, conclusion",
     [
@@ -616,13 +622,9 @@ def test_get_conclusion_for_run(run, conclusion):
 def test_get_summary_block(conclusion, emoji_link):
     conclusions = [conclusion] * 5
     block = jobs.get_summary_block("opensafely-core/airlock", conclusions)
-    assert block == {
-        "type": "section",
-        "text": {
-            "type": "mrkdwn",
-            "text": f"<https://github.com/opensafely-core/airlock/actions?query=branch%3Amain|opensafely-core/airlock>: {emoji_link * 5}",
-        },
-    }
+    assert block == section_block(
+        f"<https://github.com/opensafely-core/airlock/actions?query=branch%3Amain|opensafely-core/airlock>: {emoji_link * 5}"
+    )
 
 
 @mocketize(strict_mode=True)
@@ -651,38 +653,22 @@ def test_main_show_repo(mock_conclusions, conclusion, reported, emoji):
         Entry.GET,
         "https://api.github.com/repos/opensafely-core/airlock/actions/workflows",
         match_querystring=True,
-        body=Path("tests/workspace/workflows.json").read_text(),
+        body=WORKFLOWS_JSON,
     )
     mock_conclusions.return_value = {
         key: conclusion for key in sorted(list(WORKFLOWS_MAIN.keys()))
     }
     status = f"{emoji} {reported}"
-    args = jobs.get_command_line_parser().parse_args(
-        "show --target opensafely-core/airlock".split()
-    )
+    args = PARSER.parse_args("show --target opensafely-core/airlock".split())
     blocks = json.loads(jobs.main(args))
     assert blocks == [
-        {
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": "Workflows for opensafely-core/airlock",
-            },
-        },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"CI: {status}\nCodeQL: {status}\nTrigger a deploy of opensafely documentation site: {status}\nDependabot Updates: {status}\nLocal job-server setup CI: {status}",
-            },
-        },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": "<https://github.com/opensafely-core/airlock/actions?query=branch%3Amain|View Github Actions>",
-            },
-        },
+        header_block("Workflows for opensafely-core/airlock"),
+        section_block(
+            f"CI: {status}\nCodeQL: {status}\nTrigger a deploy of opensafely documentation site: {status}\nDependabot Updates: {status}\nLocal job-server setup CI: {status}"
+        ),
+        section_block(
+            "<https://github.com/opensafely-core/airlock/actions?query=branch%3Amain|View Github Actions>"
+        ),
     ]
 
 
@@ -693,32 +679,51 @@ def test_main_show_repo(mock_conclusions, conclusion, reported, emoji):
             "org": "opensafely-core",
             "repo": "failing-repo",
             "team": "Team REX",
-            "conclusions": [["failure", "http://example.com/run/1"]] * 5,
+            "conclusions": FAILED_RUNS,
         },
     ]
 )
 def test_main_show_org():
     # Call main for an organisation without skipping successful workflows
     # The failing repo should appear first
-    args = jobs.get_command_line_parser().parse_args("show --target osc".split())
+    args = PARSER.parse_args("show --target osc".split())
 
     blocks = json.loads(jobs.main(args))
     assert blocks == [
+        header_block("Workflows for opensafely-core repos"),
+        # Failing repo should appear first
+        section_block(
+            f"<https://github.com/opensafely-core/failing-repo/actions?query=branch%3Amain|opensafely-core/failing-repo>: {FAILED_RUNS_TEXT}"
+        ),
+        RESULT_BLOCK,
+    ]
+
+
+@use_mock_results(
+    [
         {
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": "Workflows for opensafely-core repos",
-            },
+            "org": "opensafely-core",
+            "repo": "mostly-passing-repo",
+            "team": "Team REX",
+            "conclusions": SUCCESSFUL_RUNS[:3] + FAILED_RUNS[:1] + SUCCESSFUL_RUNS[:1],
         },
-        {  # Failing repo should appear first
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"<https://github.com/opensafely-core/failing-repo/actions?query=branch%3Amain|opensafely-core/failing-repo>: {'<http://example.com/run/1|:red_circle:>' * 5}",
-            },
+        {
+            "org": "opensafely-core",
+            "repo": "mostly-failing-repo",
+            "team": "Team REX",
+            "conclusions": FAILED_RUNS[:3] + SUCCESSFUL_RUNS[:1] + FAILED_RUNS[:1],
         },
-        RESULT_BLOCK,
+    ]
+)
+def test_main_show_org_sorts_by_success_rate():
+    # Repos are sorted by the success rate of all their workflows, not just
+    # the first one
+    args = PARSER.parse_args("show --target osc".split())
+
+    blocks = json.loads(jobs.main(args))
+    assert [block["text"]["text"].split(">")[0] for block in blocks[1:]] == [
+        "<https://github.com/opensafely-core/mostly-failing-repo/actions?query=branch%3Amain|opensafely-core/mostly-failing-repo",
+        "<https://github.com/opensafely-core/mostly-passing-repo/actions?query=branch%3Amain|opensafely-core/mostly-passing-repo",
     ]
 
 
@@ -729,36 +734,20 @@ def test_main_show_org():
             "org": "opensafely",
             "repo": "failing-repo",
             "team": "Team RAP",
-            "conclusions": [["failure", "http://example.com/run/1"]] * 5,
+            "conclusions": FAILED_RUNS,
         },
     ]
 )
 def test_main_show_list_of_orgs():
-    args = jobs.get_command_line_parser().parse_args(["show", "--target", "os osc"])
+    args = PARSER.parse_args(["show", "--target", "os osc"])
 
     blocks = json.loads(jobs.main(args))
     assert blocks == [
-        {
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": "Workflows for opensafely repos",
-            },
-        },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"<https://github.com/opensafely/failing-repo/actions?query=branch%3Amain|opensafely/failing-repo>: {'<http://example.com/run/1|:red_circle:>' * 5}",
-            },
-        },
-        {
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": "Workflows for opensafely-core repos",
-            },
-        },
+        header_block("Workflows for opensafely repos"),
+        section_block(
+            f"<https://github.com/opensafely/failing-repo/actions?query=branch%3Amain|opensafely/failing-repo>: {FAILED_RUNS_TEXT}"
+        ),
+        header_block("Workflows for opensafely-core repos"),
         RESULT_BLOCK,
     ]
 
@@ -770,31 +759,19 @@ def test_main_show_list_of_orgs():
             "org": "opensafely",
             "repo": "failing-repo",
             "team": "Team RAP",
-            "conclusions": [["failure", "http://example.com/run/1"]] * 5,
+            "conclusions": FAILED_RUNS,
         },
     ]
 )
 def test_main_show_list_of_repos():
-    args = jobs.get_command_line_parser().parse_args(
-        ["show", "--target", "airlock failing-repo"]
-    )
+    args = PARSER.parse_args(["show", "--target", "airlock failing-repo"])
 
     blocks = json.loads(jobs.main(args))
     assert blocks == [
-        {
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": "Workflows summary",
-            },
-        },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"<https://github.com/opensafely/failing-repo/actions?query=branch%3Amain|opensafely/failing-repo>: {'<http://example.com/run/1|:red_circle:>' * 5}",
-            },
-        },
+        header_block("Workflows summary"),
+        section_block(
+            f"<https://github.com/opensafely/failing-repo/actions?query=branch%3Amain|opensafely/failing-repo>: {FAILED_RUNS_TEXT}"
+        ),
         RESULT_BLOCK,
     ]
 
@@ -806,36 +783,20 @@ def test_main_show_list_of_repos():
             "org": "opensafely",
             "repo": "documentation",
             "team": "Team REX",
-            "conclusions": [["success", "http://example.com/run/1"]] * 5,
+            "conclusions": SUCCESSFUL_RUNS,
         },
     ]
 )
 def test_main_show_all():
     # Call main for all repos without skipping successful workflows
-    args = jobs.get_command_line_parser().parse_args("show".split())
+    args = PARSER.parse_args("show".split())
     blocks = json.loads(jobs.main(args))
     assert blocks == [
-        {
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": "Workflows for Team REX",
-            },
-        },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"<https://github.com/opensafely/documentation/actions?query=branch%3Amain|opensafely/documentation>: {'<http://example.com/run/1|:large_green_circle:>' * 5}",
-            },
-        },
-        {
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": "Workflows for Team RAP",
-            },
-        },
+        header_block("Workflows for Team REX"),
+        section_block(
+            f"<https://github.com/opensafely/documentation/actions?query=branch%3Amain|opensafely/documentation>: {SUCCESSFUL_RUNS_TEXT}"
+        ),
+        header_block("Workflows for Team RAP"),
         RESULT_BLOCK,
     ]
 
@@ -847,7 +808,7 @@ def test_main_show_all():
             "org": "opensafely",
             "repo": "failing-repo",
             "team": "Team REX",
-            "conclusions": [["failure", "http://example.com/run/1"]] * 5,
+            "conclusions": FAILED_RUNS,
         },
     ],
     workflows_overrides={
@@ -865,16 +826,11 @@ def test_main_show_all():
 def test_main_show_all_skip_failures():
     # Call main for all repos without skipping successful workflows
     # Since all workflows in failing-repo are known to fail, it should be skipped entirely
-    args = jobs.get_command_line_parser().parse_args("show".split())
+    args = PARSER.parse_args("show".split())
     blocks = json.loads(jobs.main(args))
     assert blocks == [
-        {  # Only the Team RAP section should appear
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": "Workflows for Team RAP",
-            },
-        },
+        # Only the Team RAP section should appear
+        header_block("Workflows for Team RAP"),
         RESULT_BLOCK,
     ]
 
@@ -886,23 +842,17 @@ def test_main_show_all_skip_failures():
             "org": "opensafely",
             "repo": "documentation",
             "team": "Team REX",
-            "conclusions": [["success", "http://example.com/run/1"]] * 5,
+            "conclusions": SUCCESSFUL_RUNS,
         },
     ]
 )
 def test_main_show_failed_empty():
     # Call main for all repos with skipping successful workflows
     # No failed workflows so state so
-    args = jobs.get_command_line_parser().parse_args("show --skip-successful".split())
+    args = PARSER.parse_args("show --skip-successful".split())
     blocks = json.loads(jobs.main(args))
     assert blocks == [
-        {
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": "No workflow failures to report!",
-            },
-        },
+        header_block("No workflow failures to report!"),
     ]
 
 
@@ -913,31 +863,22 @@ def test_main_show_failed_empty():
             "org": "opensafely",
             "repo": "failing-repo",
             "team": "Team REX",
-            "conclusions": [["failure", "http://example.com/run/1"]] * 5,
+            "conclusions": FAILED_RUNS,
         },
     ]
 )
 def test_main_show_failed_found():
     # Call main for all repos with skipping successful workflows
     # Only the failing repo should appear
-    args = jobs.get_command_line_parser().parse_args("show --skip-successful".split())
+    args = PARSER.parse_args("show --skip-successful".split())
 
     blocks = json.loads(jobs.main(args))
     assert blocks == [
-        {  # Only the Team REX section should appear
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": "Workflows for Team REX",
-            },
-        },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"<https://github.com/opensafely/failing-repo/actions?query=branch%3Amain|opensafely/failing-repo>: {'<http://example.com/run/1|:red_circle:>' * 5}",
-            },
-        },
+        # Only the Team REX section should appear
+        header_block("Workflows for Team REX"),
+        section_block(
+            f"<https://github.com/opensafely/failing-repo/actions?query=branch%3Amain|opensafely/failing-repo>: {FAILED_RUNS_TEXT}"
+        ),
     ]
 
 
@@ -981,52 +922,29 @@ def test_main_show_failed_found():
 def test_main_show_failed_skipped():
     # Call main for all repos with skipping successful workflows
     # Skip failures that are already known
-    args = jobs.get_command_line_parser().parse_args("show --skip-successful".split())
+    args = PARSER.parse_args("show --skip-successful".split())
 
     blocks = json.loads(jobs.main(args))
     assert blocks == [
-        {  # Only the Team REX section should appear and all workflows should be present
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": "Workflows for Team REX",
-            },
-        },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": (
-                    "<https://github.com/opensafely/failing-repo/actions?query=branch%3Amain|opensafely/failing-repo>: "
-                    "<http://example.com/run/success|:large_green_circle:>"
-                    f"{'<http://example.com/run/fail|:red_circle:>' * 4}"
-                ),
-            },
-        },
+        # Only the Team REX section should appear and all workflows should be present
+        header_block("Workflows for Team REX"),
+        section_block(
+            "<https://github.com/opensafely/failing-repo/actions?query=branch%3Amain|opensafely/failing-repo>: "
+            "<http://example.com/run/success|:large_green_circle:>"
+            f"{'<http://example.com/run/fail|:red_circle:>' * 4}"
+        ),
     ]
 
 
 def test_main_show_invalid_target():
     # Call main with an invalid org
-    args = jobs.get_command_line_parser().parse_args(
-        "show --target invalid-org".split()
-    )
+    args = PARSER.parse_args("show --target invalid-org".split())
     blocks = json.loads(jobs.main(args))
     assert blocks == [
-        {
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": "invalid-org was not recognised",
-            },
-        },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": "Run `@test_username workflows usage` to see the valid values for `target`.",
-            },
-        },
+        header_block("invalid-org was not recognised"),
+        section_block(
+            "Run `@test_username workflows usage` to see the valid values for `target`."
+        ),
     ]
 
 
@@ -1065,37 +983,20 @@ def test_main_show_invalid_target():
     },
 )
 def test_show_group():
-    args = jobs.get_command_line_parser().parse_args("show --group check-links".split())
+    args = PARSER.parse_args("show --group check-links".split())
     blocks = json.loads(jobs.main(args))
     assert blocks == [
-        {  # Only 1 emoji should appear for each repo
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": "Link-checking workflows",
-            },
-        },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": "<https://github.com/opensafely/documentation/actions?query=branch%3Amain|opensafely/documentation>: <https://example.com/run/success|:large_green_circle:>",
-            },
-        },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": "<https://github.com/ebmdatalab/bennett.ox.ac.uk/actions?query=branch%3Amain|ebmdatalab/bennett.ox.ac.uk>: <https://example.com/run/success|:large_green_circle:>",
-            },
-        },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": "<https://github.com/ebmdatalab/team-manual/actions?query=branch%3Amain|ebmdatalab/team-manual>: <https://example.com/run/fail|:red_circle:>",
-            },
-        },
+        # Only 1 emoji should appear for each repo
+        header_block("Link-checking workflows"),
+        section_block(
+            "<https://github.com/opensafely/documentation/actions?query=branch%3Amain|opensafely/documentation>: <https://example.com/run/success|:large_green_circle:>"
+        ),
+        section_block(
+            "<https://github.com/ebmdatalab/bennett.ox.ac.uk/actions?query=branch%3Amain|ebmdatalab/bennett.ox.ac.uk>: <https://example.com/run/success|:large_green_circle:>"
+        ),
+        section_block(
+            "<https://github.com/ebmdatalab/team-manual/actions?query=branch%3Amain|ebmdatalab/team-manual>: <https://example.com/run/fail|:red_circle:>"
+        ),
     ]
 
 
@@ -1115,23 +1016,11 @@ def test_show_group():
     },
 )
 def test_show_group_not_found(_):
-    args = jobs.get_command_line_parser().parse_args("show --group unknown".split())
+    args = PARSER.parse_args("show --group unknown".split())
     blocks = json.loads(jobs.main(args))
     assert blocks == [
-        {
-            "type": "header",
-            "text": {
-                "type": "plain_text",
-                "text": "Group unknown was not defined",
-            },
-        },
-        {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": "Available custom workflow groups are: check-links",
-            },
-        },
+        header_block("Group unknown was not defined"),
+        section_block("Available custom workflow groups are: check-links"),
     ]
 
 
@@ -1142,13 +1031,13 @@ def test_show_group_not_found(_):
             "org": "opensafely",
             "repo": "excluded-repo",
             "team": "Team REX",
-            "conclusions": [["failure", "http://example.com/run/1"]] * 5,
+            "conclusions": FAILED_RUNS,
         },
     ],
     workflows_overrides={"excluded_repos": ["opensafely/excluded-repo"]},
 )
 def test_excluded_repo_skipped_in_team_summary():
-    args = jobs.get_command_line_parser().parse_args("show".split())
+    args = PARSER.parse_args("show".split())
     blocks = json.loads(jobs.main(args))
     rendered = json.dumps(blocks)
     assert "excluded-repo" not in rendered
@@ -1159,9 +1048,7 @@ def test_excluded_repo_skipped_in_team_summary():
     workflows_overrides={"excluded_repos": ["opensafely-core/airlock"]},
 )
 def test_excluded_repo_rejected_as_explicit_target():
-    args = jobs.get_command_line_parser().parse_args(
-        "show --target opensafely-core/airlock".split()
-    )
+    args = PARSER.parse_args("show --target opensafely-core/airlock".split())
     blocks = json.loads(jobs.main(args))
     assert "was not recognised" in blocks[0]["text"]["text"]
 
@@ -1173,12 +1060,12 @@ def test_excluded_repo_rejected_as_explicit_target():
             "org": "opensafely",
             "repo": "airlock",
             "team": "Team REX",
-            "conclusions": [["success", "http://example.com/run/1"]] * 5,
+            "conclusions": SUCCESSFUL_RUNS,
         },
     ]
 )
 def test_ambiguous_bare_repo_name_rejected():
-    args = jobs.get_command_line_parser().parse_args("show --target airlock".split())
+    args = PARSER.parse_args("show --target airlock".split())
     blocks = json.loads(jobs.main(args))
     assert blocks[0]["text"]["text"] == "airlock is ambiguous"
     body_text = blocks[1]["text"]["text"]
@@ -44,21 +44,23 @@ class DependabotRotaReporter(RotaReporter):
         return f"To review dependabot PRs {this_or_next} week ({self.format_week(monday)}): {checker}"
 
 
-def report_rota() -> str:
-    repos = [
-        ("opensafely-core", "job-server"),
-        ("opensafely-core", "opencodelists"),
-        ("ebmdatalab", "metrics"),
-        ("opensafely-core", "reports"),
-        ("opensafely-core", "actions-registry"),
-        ("opensafely-core", "research-template-docker"),
-        ("opensafely-core", "repo-template"),
-        ("opensafely-core", "osgithub"),
-        ("opensafely", "documentation"),
-        ("ebmdatalab", "bennett.ox.ac.uk"),
-        ("ebmdatalab", "team-manual"),
-        ("bennettoxford", "opensafely-wp"),
-    ]
+REPOS = [
+    ("opensafely-core", "job-server"),
+    ("opensafely-core", "opencodelists"),
+    ("ebmdatalab", "metrics"),
+    ("opensafely-core", "reports"),
+    ("opensafely-core", "actions-registry"),
+    ("opensafely-core", "research-template-docker"),
+    ("opensafely-core", "repo-template"),
+    ("opensafely-core", "osgithub"),
+    ("opensafely", "documentation"),
+    ("ebmdatalab", "bennett.ox.ac.uk"),
+    ("ebmdatalab", "team-manual"),
+    ("bennettoxford", "opensafely-wp"),
+]
+
+
+def _build_extra_text(repos) -> str:
     repo_links = [
         f"<https://github.com/{org}/{repo}/pulls|{repo}>" for org, repo in repos
     ]
@@ -67,14 +69,20 @@ def report_rota() -> str:
     )
 
     repo_links_text = ", ".join(repo_links[:-1]) + " and " + repo_links[-1]
-    extra_text = (
+    return (
         f"\nReview repos {repo_links_text}. <{combined_link}|Combined link>. "
         "Merge any outstanding non-NPM Dependabot/update-dependencies-action PRs.\n"
         "Review Thomas' PRs for NPM updates.\n"
         "Please also review the Codespaces at risk report.\n"
     )
 
-    return DependabotRotaReporter(title="Dependabot rota").report(extra_text)
+
+# The repo list is static, so the text listing them is only built once
+EXTRA_TEXT = _build_extra_text(REPOS)
+
+
+def report_rota() -> str:
+    return DependabotRotaReporter(title="Dependabot rota").report(EXTRA_TEXT)
 
 
 if __name__ == "__main__":
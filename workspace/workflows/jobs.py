@@ -1,8 +1,8 @@
 import argparse
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from urllib.parse import urljoin
 
 from bennettbot import settings
 from workspace.utils import repos_config as config
@@ -17,6 +17,8 @@ from workspace.utils.github_rest_api import GitHubAPIClient
 
 
 CACHE_PATH = settings.WRITEABLE_DIR / "workflows_cache.json"
+# Maximum number of repos to fetch workflow runs for at once
+MAX_WORKERS = 8
 # Requires `repo` scope for Actions workflows/runs on private repos.
 github_client = GitHubAPIClient(os.environ["DATA_TEAM_GITHUB_API_TOKEN"])
 EMOJI = {
@@ -58,12 +60,21 @@ def load_cache() -> dict:
     return json.loads(CACHE_PATH.read_text())
 
 
+def write_cache(cache_file_contents):
+    # Replace the file atomically so that nothing loading the cache ever sees
+    # a partly written file. The temporary file is per process, as workflows
+    # jobs of different types can run at the same time.
+    tmp_path = CACHE_PATH.with_name(f".{CACHE_PATH.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(cache_file_contents))
+    os.replace(tmp_path, CACHE_PATH)
+
+
 def get_github_actions_link(repo_full_name):
     return f"https://github.com/{repo_full_name}/actions?query=branch%3Amain"
 
 
 class RepoWorkflowReporter:
-    def __init__(self, repo_full_name):
+    def __init__(self, repo_full_name, cache_file_contents=None):
         """
         Retrieves and reports on the status of workflow runs on the main branch in a specified repo.
         Workflows that are not on the main branch are skipped.
@@ -79,8 +90,12 @@ class RepoWorkflowReporter:
         Parameters:
             repo_full_name: str
                 The full name of the repo in the format "org/repo" (e.g. "opensafely/documentation")
+            cache_file_contents: dict, optional
+                The loaded contents of workflows_cache.json, when shared between reporters for several repos.
+                The repo's cache is read from and updated in this dict, and the caller is responsible for writing it to file.
         """
         self.repo_full_name = repo_full_name
+        self.cache_file_contents = cache_file_contents
         self.base_api_url = f"https://api.github.com/repos/{self.repo_full_name}/"
         self.github_actions_link = get_github_actions_link(self.repo_full_name)
 
@@ -91,7 +106,11 @@ class RepoWorkflowReporter:
         self.cache = self._load_cache_for_repo()
 
     def _load_cache_for_repo(self) -> dict:
-        cache = load_cache().get(self.repo_full_name, {})
+        if self.cache_file_contents is None:
+            cache_file_contents = load_cache()
+        else:
+            cache_file_contents = self.cache_file_contents
+        cache = cache_file_contents.get(self.repo_full_name, {})
         if cache.get("version") != self.cache_version:
             return {}
         return cache
@@ -102,7 +121,7 @@ class RepoWorkflowReporter:
         return self.cache.get("timestamp", None)
 
     def _get_json_response(self, path, params=None):
-        url = urljoin(self.base_api_url, path)
+        url = f"{self.base_api_url}{path}"
         return github_client.get_json(url, params)
 
     def get_workflows(self) -> dict:
@@ -180,10 +199,12 @@ class RepoWorkflowReporter:
         return
 
     def write_cache_to_file(self):
+        if self.cache_file_contents is not None:
+            self.cache_file_contents[self.repo_full_name] = self.cache
+            return
         cache_file_contents = load_cache()
         cache_file_contents[self.repo_full_name] = self.cache
-        with open(CACHE_PATH, "w") as f:
-            f.write(json.dumps(cache_file_contents))
+        write_cache(cache_file_contents)
 
     def report(self) -> str:
         # This needs to be a class method as it uses self.workflows for names
@@ -204,18 +225,17 @@ class RepoWorkflowReporter:
         return json.dumps(blocks)
 
     def find_latest_for_each_workflow(self, all_runs) -> list:
-        latest_runs = []
-        found_ids = set()
+        # Runs are ordered newest first, so the first run seen for each workflow
+        # is its latest
+        latest_runs = {}
         for run in all_runs:
-            if run["workflow_id"] in found_ids:
-                continue
-            if run["workflow_id"] in self.workflow_ids:
-                latest_runs.append(run)
-                found_ids.add(run["workflow_id"])
-            if found_ids == self.workflow_ids:
-                return latest_runs, set()
-        missing_ids = self.workflow_ids - found_ids
-        return latest_runs, missing_ids
+            workflow_id = run["workflow_id"]
+            if workflow_id in self.workflow_ids and workflow_id not in latest_runs:
+                latest_runs[workflow_id] = run
+                if len(latest_runs) == len(self.workflow_ids):
+                    break
+        missing_ids = self.workflow_ids - latest_runs.keys()
+        return list(latest_runs.values()), missing_ids
 
 
 def _format_run_url(run_url, link_text):
@@ -239,13 +259,43 @@ def get_success_rate(conclusions) -> float:
     return conclusions.count("success") / len(conclusions)
 
 
+def get_latest_conclusions_for_repos(repo_full_names) -> dict:
+    """
+    Get the latest workflow conclusions for each repo, keyed by repo full name.
+    Each repo needs its own GitHub API calls, so fetch several repos at once.
+    The cache file is read once for all the repos, and the repos' new entries
+    are written to it together at the end, even if some repos fail.
+    """
+    cache_file_contents = load_cache()
+    updated_entries = {}
+
+    # No lock is needed: each thread only reads and writes its own repo's key in
+    # cache_file_contents and updated_entries, and the shared requests session
+    # only makes GET requests through urllib3's thread-safe connection pool
+    def get_latest_conclusions(repo_full_name):
+        reporter = RepoWorkflowReporter(repo_full_name, cache_file_contents)
+        conclusions = reporter.get_latest_conclusions()
+        updated_entries[repo_full_name] = reporter.cache
+        return conclusions
+
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            results = executor.map(get_latest_conclusions, repo_full_names)
+            conclusions = dict(zip(repo_full_names, results))
+    finally:
+        # Reload the file so that entries written by other jobs in the meantime
+        # aren't lost
+        if updated_entries:
+            write_cache({**load_cache(), **updated_entries})
+    return conclusions
+
+
 def _summarise(
     header_text: str, repo_full_names: list[str], skip_successful: bool
 ) -> list:
     unsorted = {}
-    for repo_full_name in repo_full_names:
-        wf_conclusions = RepoWorkflowReporter(repo_full_name).get_latest_conclusions()
-
+    latest_conclusions = get_latest_conclusions_for_repos(repo_full_names)
+    for repo_full_name, wf_conclusions in latest_conclusions.items():
         # Skip reporting missing workflows and failures that are already known
         known_failure_ids = config.workflows_config()["workflows_known_to_fail"].get(
             repo_full_name, []
@@ -259,23 +309,20 @@ def _summarise(
         if len(wf_conclusions) == 0:
             continue
 
-        if (
-            skip_successful
-            and get_success_rate(
-                [wf_conclusion[0] for wf_conclusion in wf_conclusions.values()]
-            )
-            == 1
-        ):
+        success_rate = get_success_rate(
+            [wf_conclusion[0] for wf_conclusion in wf_conclusions.values()]
+        )
+        if skip_successful and success_rate == 1:
             continue
-        unsorted[repo_full_name] = list(wf_conclusions.values())
+        unsorted[repo_full_name] = (success_rate, list(wf_conclusions.values()))
 
-    key = lambda item: get_success_rate(item[1][0])
-    conclusions = sorted(unsorted.items(), key=key)
+    # Least successful repos first
+    conclusions = sorted(unsorted.items(), key=lambda item: item[1][0])
     blocks = [
         get_header_block(header_text),
         *[
             get_summary_block(repo_full_name, conc)
-            for repo_full_name, conc in conclusions
+            for repo_full_name, (_, conc) in conclusions
         ],
     ]
     return blocks
@@ -328,8 +375,11 @@ def summarise_workflows_group(group: str, skip_successful: bool) -> list:
         )
 
     conclusions = {}
+    latest_conclusions = get_latest_conclusions_for_repos(
+        list(group_config["workflows"])
+    )
     for repo_full_name, workflow_ids in group_config["workflows"].items():
-        wf_conclusions = RepoWorkflowReporter(repo_full_name).get_latest_conclusions()
+        wf_conclusions = latest_conclusions[repo_full_name]
         conclusions[repo_full_name] = [
             wf_conclusions.get(wf_id, "missing") for wf_id in workflow_ids
         ]
@@ -378,6 +428,9 @@ def _main(targets: list[str], skip_successful: bool) -> str:
         return json.dumps(summarise_all(skip_successful))
 
     # Validation
+    org_shorthands = config.org_shorthands()
+    known_orgs = set(org_shorthands.values())
+    excluded_repos = set(get_excluded_repos())
     orgs = []
     repo_full_names = []
     for target in targets:
@@ -387,7 +440,6 @@ def _main(targets: list[str], skip_successful: bool) -> str:
         if target.count("/") > 1:
             return report_invalid_target(target)
 
-        org_shorthands = config.org_shorthands()
         if "/" in target:  # Single repo in org/repo format
             org, repo = target.split("/")
         elif matching_orgs := config.find_orgs_for_repo(target):
@@ -398,11 +450,11 @@ def _main(targets: list[str], skip_successful: bool) -> str:
             org, repo = target, None
 
         org = org_shorthands.get(org, org)
-        if org not in org_shorthands.values():
+        if org not in known_orgs:
             return report_invalid_target(target)
         if repo:
             full_name = f"{org}/{repo}"
-            if full_name in get_excluded_repos():
+            if full_name in excluded_repos:
                 return report_invalid_target(target)
             repo_full_names.append(full_name)
         else: